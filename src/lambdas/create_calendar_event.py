@@ -4,6 +4,7 @@ import boto3
 import logging
 import traceback
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 from typing import List, Dict, Any
@@ -12,6 +13,72 @@ from typing import List, Dict, Any
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+TIME_ZONE = 'America/Sao_Paulo'
+
+# Função para converter um horário ISO em datetime com fuso horário
+def parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=ZoneInfo(TIME_ZONE))
+    return parsed
+
+# Função para converter o início/fim de um evento do Google Calendar (dateTime ou date, para eventos de dia inteiro)
+def parse_event_time(value: Dict[str, Any]) -> datetime:
+    if 'dateTime' in value:
+        return parse_time(value['dateTime'])
+    return datetime.fromisoformat(value['date']).replace(tzinfo=ZoneInfo(value.get('timeZone', TIME_ZONE)))
+
+# Função para verificar se um evento ocupa a agenda (cancelados e marcados como "livre" não bloqueiam)
+def is_blocking_event(event: Dict[str, Any]) -> bool:
+    return (
+        event.get('status') != 'cancelled'
+        and event.get('transparency') != 'transparent'
+        and 'start' in event
+        and 'end' in event
+    )
+
+# Função para buscar, direto no Google Calendar, os eventos que conflitam com o intervalo [start, end)
+def find_conflicting_events(
+    credentials: Credentials,
+    calendar_id: str,
+    start: datetime,
+    end: datetime
+) -> List[Dict[str, Any]]:
+    try:
+        logger.info(f"Verificando conflitos no calendar_id {calendar_id} entre {start.isoformat()} e {end.isoformat()}")
+        service = build('calendar', 'v3', credentials=credentials)
+
+        conflicts = []
+        page_token = None
+        while True:
+            events_result = service.events().list(
+                calendarId=calendar_id,
+                timeMin=start.isoformat(),
+                timeMax=end.isoformat(),
+                singleEvents=True,
+                pageToken=page_token
+            ).execute()
+
+            # Intervalos semiabertos: eventos que apenas se encostam não são conflito
+            for calendar_event in events_result.get('items', []):
+                if (
+                    is_blocking_event(calendar_event)
+                    and parse_event_time(calendar_event['start']) < end
+                    and start < parse_event_time(calendar_event['end'])
+                ):
+                    conflicts.append(calendar_event)
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
+
+        logger.info(f"{len(conflicts)} conflito(s) encontrado(s) para o calendar_id {calendar_id}")
+        return sorted(conflicts, key=lambda calendar_event: parse_event_time(calendar_event['start']))
+    except Exception as e:
+        logger.error(f"Erro ao verificar conflitos no Google Calendar: {str(e)}")
+        traceback.print_exc()
+        raise RuntimeError("Falha ao verificar conflitos no Google Calendar") from e
+
 # Função para buscar as credenciais do S3
 def get_google_credentials(user_id: str) -> Credentials:
     s3_client = boto3.client('s3')
@@ -58,11 +125,11 @@ def create_calendar_event(
             'description': description,
             'start': {
                 'dateTime': start_time,
-                'timeZone': 'America/Sao_Paulo',  
+                'timeZone': TIME_ZONE,
             },
             'end': {
                 'dateTime': end_time,
-                'timeZone': 'America/Sao_Paulo',  
+                'timeZone': TIME_ZONE,
             },
             'attendees': [{'email': attendee} for attendee in attendees],
             'reminders': {
@@ -90,11 +157,40 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         attendees = body['attendees']
         summary = body['summary']
         description = body.get('description', '')
+        reject_on_conflict = body.get('reject_on_conflict', False)
+
+        try:
+            if not isinstance(reject_on_conflict, bool):
+                raise ValueError("reject_on_conflict deve ser booleano")
+            if reject_on_conflict:
+                start, end = parse_time(start_time), parse_time(end_time)
+        except ValueError as ve:
+            logger.error(f"Valor inválido no corpo da requisição: {str(ve)}")
+            return {
+                'statusCode': 400,
+                'body': json.dumps({'error': f'Valor inválido no corpo da requisição: {str(ve)}'}),
+                'headers': {
+                    'Content-Type': 'application/json'
+                }
+            }
 
         logger.info(f"Requisição recebida para criar evento: user_id={user_id}, calendar_id={calendar_id}")
-        logger.info(f"start_time={start_time}, end_time={end_time}, attendees={attendees}, summary={summary}, description={description}")
+        logger.info(f"start_time={start_time}, end_time={end_time}, attendees={attendees}, summary={summary}, description={description}, reject_on_conflict={reject_on_conflict}")
 
         credentials = get_google_credentials(user_id)
+
+        if reject_on_conflict:
+            conflicts = find_conflicting_events(credentials, calendar_id, start, end)
+            if conflicts:
+                logger.info(f"Evento não criado no calendar_id {calendar_id} por conflito com eventos existentes")
+                return {
+                    'statusCode': 409,
+                    'body': json.dumps({'error': 'Conflito com eventos existentes', 'conflicts': conflicts}),
+                    'headers': {
+                        'Content-Type': 'application/json'
+                    }
+                }
+
         event_result = create_calendar_event(credentials, calendar_id, start_time, end_time, attendees, summary, description)
 
         return {